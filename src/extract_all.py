@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Script to extract case titles and trial dates from HTML files in a single pass.
+Reads each HTML file once, extracts the body text once, and runs both the title
+and the date strategies on it, then updates each JSON file with one write.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from extract_case_titles import (
+    extract_title_from_content, extract_title_from_filename, html_snippet_is_final,
+)
+from extract_trial_dates import extract_text_first_150_lines, find_judgment_date_in_html
+from extraction_common import (
+    FADV_DONTNEED, FADV_WILLNEED, HTML_HEAD_CHARS, MANIFEST_HAS_DATE,
+    MANIFEST_HAS_TITLE, complete_html_head, fadvise, has_case_title, is_complete,
+    iter_json_files, load_json, load_manifest, manifest_entry, save_manifest,
+    track_progress, write_json_fields,
+)
+
+def extract_title_and_date(html_content: str, want_title: bool = True, want_date: bool = True,
+                           use_html_parsing: bool = True) -> Tuple[Optional[str], Optional[str]]:
+    """Extract case title and judgment date from HTML content, parsing the body once."""
+    # Title needs the first 50 lines and date the first 150, so share one extraction
+    lines: Optional[List[str]] = None
+    if want_title:
+        lines = extract_text_first_150_lines(html_content)
+
+    title = extract_title_from_content(html_content, use_html_parsing, lines) if want_title else None
+    date = find_judgment_date_in_html(html_content, lines) if want_date else None
+    return title, date
+
+def extract_title_and_date_from_file(html_path: str, json_filename: str, want_title: bool,
+                                     want_date: bool) -> Tuple[Optional[str], Optional[str]]:
+    """Extract case title and trial date from an HTML file, reading it once."""
+    title = date = None
+    if os.path.exists(html_path):
+        try:
+            with open(html_path, 'r', encoding='utf-8', errors='ignore') as f:
+                # Title and judgment date live in the document header, so avoid reading whole files
+                fadvise(f, FADV_WILLNEED, HTML_HEAD_CHARS)
+                head = f.read(HTML_HEAD_CHARS)
+                truncated = len(head) == HTML_HEAD_CHARS
+                # A title or date line straddling the cut must not be matched half-read
+                html_content = complete_html_head(head) if truncated else head
+                title, date = extract_title_and_date(html_content, want_title, want_date)
+                missing_title = want_title and not title
+                missing_date = want_date and not date
+                if (missing_title or missing_date) and truncated:
+                    # Header was not enough; fall back to the full document. HTML
+                    # title parsing only looks at the first 5000 cleaned characters,
+                    # so it is repeated only if the header did not already settle them.
+                    snippet_complete = missing_title and html_snippet_is_final(html_content)
+                    html_content = head + f.read()
+                    more_title, more_date = extract_title_and_date(
+                        html_content, missing_title, missing_date, use_html_parsing=not snippet_complete)
+                    title = title or more_title
+                    date = date or more_date
+                # Each HTML file is read once per run; don't let it crowd the page cache
+                fadvise(f, FADV_DONTNEED)
+        except Exception as e:
+            print(f"Error reading HTML file {html_path}: {e}")
+
+    # Use filename as last resort for the title
+    if want_title and not title:
+        title = extract_title_from_filename(json_filename)
+        if title == 'pages.gif':
+            title = None
+
+    return title, date
+
+def update_json_file(json_path: str, law_finder_path: str) -> Tuple[bool, bool, Optional[list]]:
+    """Update a single JSON file with extracted case title and trial date.
+
+    Returns whether the title and the date were updated, and the file's manifest
+    entry (None on error).
+    """
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        data = load_json(raw)
+
+        # Only look for fields that are missing (or hold the 'pages.gif' placeholder)
+        want_title = not has_case_title(data)
+        want_date = not data.get('trialDate')
+        if not want_title and not want_date:
+            return False, False, manifest_entry(json_path, data)
+
+        # Get source path from metadata
+        source_path = data.get('metadata', {}).get('sourcePath', '')
+        if not source_path:
+            # Try filename as fallback for the title; there is nothing to date
+            title = extract_title_from_filename(json_path) if want_title else None
+            date = None
+        else:
+            # Construct full HTML path
+            html_path = os.path.join(law_finder_path, source_path)
+            title, date = extract_title_and_date_from_file(html_path, json_path, want_title, want_date)
+
+        fields = {}
+        if title:
+            fields['caseTitle'] = title
+        if date:
+            fields['trialDate'] = date
+        if fields:
+            write_json_fields(json_path, raw, data, fields)
+
+        return bool(title), bool(date), manifest_entry(json_path, data)
+    except Exception as e:
+        print(f"Error processing {json_path}: {e}")
+        return False, False, None
+
+def main():
+    """Main function to process all JSON files."""
+    # Get paths
+    script_dir = Path(__file__).parent
+    json_dir = script_dir / 'law-finder-json'
+    law_finder_dir = script_dir / 'LAW FINDER'
+
+    if not json_dir.exists():
+        print(f"Error: {json_dir} does not exist")
+        return
+
+    if not law_finder_dir.exists():
+        print(f"Error: {law_finder_dir} does not exist")
+        return
+
+    total = 0
+    skipped = 0
+    titles_updated = 0
+    dates_updated = 0
+    failed = 0
+
+    # Stream JSON files from the directory, skipping files the manifest marks
+    # as complete (title and date) and unchanged without opening them
+    manifest = load_manifest(json_dir)
+    pending_names = []
+
+    def pending_paths():
+        nonlocal total, skipped
+        for entry in iter_json_files(json_dir):
+            total += 1
+            if is_complete(manifest, entry, MANIFEST_HAS_TITLE, MANIFEST_HAS_DATE):
+                skipped += 1
+                continue
+            pending_names.append(entry.name)
+            yield entry.path
+
+    # Files are independent, so fan out across processes (regex work is CPU-bound)
+    worker = partial(update_json_file, law_finder_path=str(law_finder_dir))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Executor.map collects its input up front, so the counts are final here
+        results = executor.map(worker, pending_paths(), chunksize=64)
+        print(f"Processing {len(pending_names)} of {total} JSON files to extract titles and trial dates...")
+
+        progress = track_progress(results, len(pending_names))
+        for (title_updated, date_updated, entry), name in zip(progress, pending_names):
+            if entry:
+                manifest[name] = entry
+            if title_updated:
+                titles_updated += 1
+            if date_updated:
+                dates_updated += 1
+            if not title_updated and not date_updated:
+                failed += 1
+
+    failed += skipped
+    save_manifest(json_dir, manifest)
+
+    print(f"\nCompleted!")
+    print(f"Titles updated: {titles_updated}")
+    print(f"Dates updated: {dates_updated}")
+    print(f"Failed/Skipped: {failed}")
+    print(f"Total: {total}")
+
+if __name__ == '__main__':
+    main()
@@ -5,53 +5,96 @@ Extracts titles from plain text body (first 50 lines), falls back to HTML parsin
 and uses filename as last resort.
 """
 
-import json
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from html.parser import HTMLParser
 from html import unescape
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
-class TextExtractor(HTMLParser):
-    """HTML parser to extract plain text."""
-    def __init__(self):
-        super().__init__()
-        self.text = []
-        self.in_body = False
-        self.line_count = 0
-        self.max_lines = 50
-        
-    def handle_starttag(self, tag, attrs):
-        if tag.lower() == 'body':
-            self.in_body = True
-            
-    def handle_endtag(self, tag):
-        if tag.lower() == 'body':
-            self.in_body = False
-            
-    def handle_data(self, data):
-        if self.in_body and self.line_count < self.max_lines:
-            # Split by newlines and add each line
-            lines = data.split('\n')
-            for line in lines:
-                if self.line_count >= self.max_lines:
-                    break
-                stripped = line.strip()
-                if stripped:
-                    self.text.append(stripped)
-                    self.line_count += 1
+from extraction_common import (
+    FADV_DONTNEED, FADV_WILLNEED, HTML_HEAD_CHARS, MANIFEST_HAS_TITLE, body_text_lines,
+    complete_html_head, fadvise, has_case_title, is_complete, iter_json_files,
+    load_json, load_manifest, manifest_entry, save_manifest, track_progress,
+    write_json_fields,
+)
+
+# Cleaned HTML characters searched by the HTML parsing strategy
+HTML_SNIPPET_CHARS = 5000
+
+# Case title patterns, compiled once at import. One pattern per context with a
+# v./VRS alternation, so each line is scanned once ("THE REPUBLIC v." is covered
+# by the generic party prefix)
+_PARTY = r"[A-Z][A-Z\s&.,'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?"
+
+# Pattern: PLAINTIFF v./VRS DEFENDANT [optional date/citation]
+_SINGLE_LINE_TITLE_RE = re.compile(
+    rf'^({_PARTY}(?:\s+ETC\.?)?)\s+(?:v|VRS)\.?\s+({_PARTY}(?:\s+ETC\.?)?)(?:\s+\[.*?\])?',
+    re.IGNORECASE,
+)
+
+# Pattern in HTML: PLAINTIFF v./VRS DEFENDANT. The first title in document order
+# wins whichever separator it uses (separate v. and VRS patterns used to prefer
+# any "v." title over an earlier "VRS" one)
+_HTML_TITLE_RE = re.compile(rf'({_PARTY})\s+(?:v|VRS)\.?\s+({_PARTY})', re.IGNORECASE)
+
+_WS_RE = re.compile(r'\s+')
+# Trailing metadata: a bracketed date/citation or an H1/2/3 suit number onwards
+_TITLE_TAIL_RE = re.compile(r'\s*\[.*?\]\s*$|\s*H\d+/\d+/\d+.*?$')
+_TAG_RE = re.compile(r'<[^>]+>')
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+_SCRIPT_STYLE_OPEN_RE = re.compile(r'<(?:script|style)', re.IGNORECASE)
+_VRS_RE = re.compile(r'\b(V\.?|VRS\.?|VERSUS)\b')
+_PARTY_RE = re.compile(r'^([A-Z][A-Z\s&.,\'\-\d()]+)')
+# Metadata words that disqualify a split-title party line (substring match)
+_PLAINTIFF_METADATA_RE = re.compile(r'PLAINTIFF|RESPONDENT|APPELLANT|CORAM|JUDGMENT')
+_DEFENDANT_METADATA_RE = re.compile(r'DEFENDANT|RESPONDENT|APPELLANT')
+# Court folder prefixes on flattened JSON filenames
+_PREFIX_RE = re.compile(r'(?:COURT OF APPEAL|SUPREME COURT|WACA|WALR)__')
+_MATTER_RE = re.compile(r'(IN\s+THE\s+MATTER\s+OF[^\.]+)', re.IGNORECASE)
 
 def extract_plain_text_first_50_lines(html_content: str) -> str:
     """Extract plain text from first 50 lines of HTML body."""
-    parser = TextExtractor()
     try:
-        parser.feed(html_content)
-        return '\n'.join(parser.text[:50])
+        return '\n'.join(body_text_lines(html_content, 50))
     except Exception as e:
         print(f"Error extracting plain text: {e}")
         return ""
 
+def strip_scripts_and_styles(html_content: str, limit: Optional[int] = None) -> str:
+    """Remove <script> and <style> blocks in a single pass.
+
+    If limit is given, scanning stops as soon as that many characters of
+    cleaned HTML have been collected.
+    """
+    parts = []
+    size = 0
+    pos = 0
+    for match in _SCRIPT_STYLE_RE.finditer(html_content):
+        chunk = html_content[pos:match.start()]
+        parts.append(chunk)
+        size += len(chunk)
+        pos = match.end()
+        if limit is not None and size >= limit:
+            return ''.join(parts)[:limit]
+    parts.append(html_content[pos:])
+    cleaned = ''.join(parts)
+    return cleaned[:limit] if limit is not None else cleaned
+
+def html_snippet_is_final(html_head: str) -> bool:
+    """Whether the HTML parsing snippet of html_head is the same as the full document's.
+    
+    True when the head already yields HTML_SNIPPET_CHARS cleaned characters and
+    no <script>/<style> block opens (or is cut off) before that point without
+    closing inside the head.
+    """
+    cleaned = strip_scripts_and_styles(html_head)
+    opener_end = HTML_SNIPPET_CHARS + len('<script')
+    if len(cleaned) < opener_end:
+        return False
+    return not _SCRIPT_STYLE_OPEN_RE.search(cleaned, 0, opener_end)
+
 def find_case_title_in_text(text: str) -> Optional[str]:
     """Find case title pattern in plain text."""
     # Clean up text - remove HTML entities
@@ -61,52 +104,40 @@ def find_case_title_in_text(text: str) -> Optional[str]:
     lines = [line.strip() for line in text.split('\n') if line.strip()]
     
     # Strategy 1: Look for complete title on a single line
-    single_line_patterns = [
-        # Pattern: PLAINTIFF v. DEFENDANT [optional date/citation]
-        r'^([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?(?:\s+ETC\.?)?)\s+v\.?\s+([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?(?:\s+ETC\.?)?)(?:\s+\[.*?\])?',
-        # Pattern: PLAINTIFF VRS DEFENDANT
-        r'^([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?(?:\s+ETC\.?)?)\s+VRS\.?\s+([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?(?:\s+ETC\.?)?)',
-        # Pattern: THE REPUBLIC v. DEFENDANT
-        r'^(THE\s+REPUBLIC)\s+v\.?\s+([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?(?:\s+ETC\.?)?)',
-    ]
-    
     for line in lines[:30]:  # Check first 30 lines
-        for pattern in single_line_patterns:
-            match = re.match(pattern, line, re.IGNORECASE)
-            if match:
-                title = match.group(0).strip()
-                # Clean up
-                title = re.sub(r'\s*\[.*?\]\s*$', '', title)
-                title = re.sub(r'\s*H\d+/\d+/\d+.*?$', '', title)
-                title = re.sub(r'\s+', ' ', title)
-                title = title.replace('&amp;', '&')
-                if len(title) > 10 and 'pages.gif' not in title.lower():
-                    return title
+        match = _SINGLE_LINE_TITLE_RE.match(line)
+        if match:
+            title = match.group(0).strip()
+            # Clean up
+            title = _TITLE_TAIL_RE.sub('', title)
+            title = _WS_RE.sub(' ', title)
+            title = title.replace('&amp;', '&')
+            if len(title) > 10 and 'pages.gif' not in title.lower():
+                return title
     
     # Strategy 2: Look for split titles (PLAINTIFF on one line, VRS/VERSUS/v. on another, DEFENDANT on third)
     for i in range(min(20, len(lines) - 2)):
-        line1 = lines[i].upper()
-        line2 = lines[i + 1].upper() if i + 1 < len(lines) else ""
-        line3 = lines[i + 2].upper() if i + 2 < len(lines) else ""
+        # Only the separator line needs uppercasing (i + 2 is always in range here)
+        line2 = lines[i + 1].upper()
         
         # Check if line2 contains v./vrs/versus
-        if re.search(r'\b(V\.?|VRS\.?|VERSUS)\b', line2):
+        if _VRS_RE.search(line2):
             # Extract plaintiff from line1, defendant from line3
-            plaintiff_match = re.match(r'^([A-Z][A-Z\s&.,\'\-\d()]+)', lines[i])
-            defendant_match = re.match(r'^([A-Z][A-Z\s&.,\'\-\d()]+)', lines[i + 2])
+            plaintiff_match = _PARTY_RE.match(lines[i])
+            defendant_match = _PARTY_RE.match(lines[i + 2])
             
             if plaintiff_match and defendant_match:
                 plaintiff = plaintiff_match.group(1).strip()
                 defendant = defendant_match.group(1).strip()
                 
                 # Clean up
-                plaintiff = re.sub(r'\s+', ' ', plaintiff)
-                defendant = re.sub(r'\s+', ' ', defendant)
+                plaintiff = _WS_RE.sub(' ', plaintiff)
+                defendant = _WS_RE.sub(' ', defendant)
                 
-                # Skip if contains metadata words
-                if any(word in plaintiff.upper() for word in ['PLAINTIFF', 'RESPONDENT', 'APPELLANT', 'CORAM', 'JUDGMENT']):
+                # Skip if contains metadata words (_PARTY_RE only matches uppercase)
+                if _PLAINTIFF_METADATA_RE.search(plaintiff):
                     continue
-                if any(word in defendant.upper() for word in ['DEFENDANT', 'RESPONDENT', 'APPELLANT']):
+                if _DEFENDANT_METADATA_RE.search(defendant):
                     continue
                 
                 # Construct title
@@ -118,12 +149,11 @@ def find_case_title_in_text(text: str) -> Optional[str]:
                     return title
     
     # Strategy 3: Look for "IN THE MATTER OF" pattern
-    matter_pattern = r'(IN\s+THE\s+MATTER\s+OF[^\.]+)'
     full_text = ' '.join(lines[:30])
-    match = re.search(matter_pattern, full_text, re.IGNORECASE)
+    match = _MATTER_RE.search(full_text)
     if match:
         title = match.group(1).strip()
-        title = re.sub(r'\s+', ' ', title)
+        title = _WS_RE.sub(' ', title)
         if len(title) > 10:
             return title
     
@@ -132,37 +162,21 @@ def find_case_title_in_text(text: str) -> Optional[str]:
 def extract_title_from_html(html_content: str) -> Optional[str]:
     """Extract case title from HTML using more sophisticated parsing."""
     # Try to find title in HTML - look for patterns in text content
-    # Remove script and style tags first
-    html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-    html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
+    # Remove script and style tags, keeping only the first part of the HTML
+    # (first 5000 chars should contain title)
+    html_snippet = strip_scripts_and_styles(html_content, limit=HTML_SNIPPET_CHARS)
     
-    # Look for case title patterns in HTML text
-    patterns = [
-        # Pattern in HTML: PLAINTIFF v. DEFENDANT
-        r'([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?)\s+v\.?\s+([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?)',
-        # Pattern: PLAINTIFF VRS DEFENDANT
-        r'([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?)\s+VRS\.?\s+([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?)',
-        # Pattern: THE REPUBLIC v. DEFENDANT
-        r'(THE\s+REPUBLIC)\s+v\.?\s+([A-Z][A-Z\s&.,\'\-\d()]+(?:\s+&(?:\s+ANO?\.?)?)?(?:\s+&(?:\s+ORS?\.?)?)?)',
-    ]
-    
-    # Extract text from first part of HTML (first 5000 chars should contain title)
-    html_snippet = html_content[:5000]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, html_snippet, re.IGNORECASE)
-        for match in matches:
-            title = match.group(0)
-            # Remove HTML tags
-            title = re.sub(r'<[^>]+>', '', title)
-            title = unescape(title)
-            title = re.sub(r'\s+', ' ', title).strip()
-            # Remove trailing metadata
-            title = re.sub(r'\s*\[.*?\]\s*$', '', title)
-            title = re.sub(r'\s*H\d+/\d+/\d+.*?$', '', title)
-            title = title.replace('&amp;', '&')
-            if len(title) > 10 and 'pages.gif' not in title.lower():
-                return title
+    for match in _HTML_TITLE_RE.finditer(html_snippet):
+        title = match.group(0)
+        # Remove HTML tags
+        title = _TAG_RE.sub('', title)
+        title = unescape(title)
+        title = _WS_RE.sub(' ', title).strip()
+        # Remove trailing metadata
+        title = _TITLE_TAIL_RE.sub('', title)
+        title = title.replace('&amp;', '&')
+        if len(title) > 10 and 'pages.gif' not in title.lower():
+            return title
     
     return None
 
@@ -173,53 +187,74 @@ def extract_title_from_filename(filename: str) -> Optional[str]:
     base = base.replace('.json', '')
     
     # Remove common prefixes
-    prefixes = [
-        'COURT OF APPEAL__',
-        'SUPREME COURT__',
-        'WACA__',
-        'WALR__',
-    ]
-    
-    for prefix in prefixes:
-        if base.startswith(prefix):
-            base = base[len(prefix):]
-            # Remove additional path parts (like "supreme court rep cases (1)__2006A__")
-            parts = base.split('__')
-            # Take the last meaningful part (usually the case title)
-            if len(parts) > 1:
-                # Skip numeric years and folder names
-                for part in reversed(parts):
-                    if part and not part.isdigit() and not part.startswith('20') and part != 'TEMP':
-                        base = part
-                        break
+    prefix_match = _PREFIX_RE.match(base)
+    if prefix_match:
+        base = base[prefix_match.end():]
+        # Remove additional path parts (like "supreme court rep cases (1)__2006A__")
+        parts = base.split('__')
+        # Take the last meaningful part (usually the case title)
+        if len(parts) > 1:
+            # Skip numeric years and folder names
+            for part in reversed(parts):
+                if part and not part.isdigit() and not part.startswith('20') and part != 'TEMP':
+                    base = part
+                    break
     
     # Clean up the title
     base = base.replace('__', ' ')
-    base = re.sub(r'\s+', ' ', base)
+    base = _WS_RE.sub(' ', base)
     
     if len(base) > 10 and base != 'pages.gif':
         return base.strip()
     
     return None
 
+def extract_title_from_content(html_content: str, use_html_parsing: bool = True,
+                               lines: Optional[List[str]] = None) -> Optional[str]:
+    """Extract case title from HTML content (plain text first, then HTML parsing).
+    
+    lines may carry the first 50 (or more) body text lines if the caller already has them.
+    """
+    # Strategy 1: Extract from plain text (first 50 lines)
+    if lines is not None:
+        plain_text = '\n'.join(lines[:50])
+    else:
+        plain_text = extract_plain_text_first_50_lines(html_content)
+    if plain_text:
+        title = find_case_title_in_text(plain_text)
+        if title and title != 'pages.gif':
+            return title
+    
+    # Strategy 2: HTML parsing
+    if use_html_parsing:
+        title = extract_title_from_html(html_content)
+        if title and title != 'pages.gif':
+            return title
+    
+    return None
+
 def extract_case_title(html_path: str, json_filename: str) -> Optional[str]:
     """Extract case title using multiple strategies."""
-    # Strategy 1: Extract from plain text (first 50 lines)
     if os.path.exists(html_path):
         try:
             with open(html_path, 'r', encoding='utf-8', errors='ignore') as f:
-                html_content = f.read()
-            
-            # Extract plain text from first 50 lines
-            plain_text = extract_plain_text_first_50_lines(html_content)
-            if plain_text:
-                title = find_case_title_in_text(plain_text)
-                if title and title != 'pages.gif':
-                    return title
-            
-            # Strategy 2: HTML parsing
-            title = extract_title_from_html(html_content)
-            if title and title != 'pages.gif':
+                # The title lives in the document header, so avoid reading whole files
+                fadvise(f, FADV_WILLNEED, HTML_HEAD_CHARS)
+                head = f.read(HTML_HEAD_CHARS)
+                truncated = len(head) == HTML_HEAD_CHARS
+                # A title line straddling the cut must not be matched half-read
+                html_content = complete_html_head(head) if truncated else head
+                title = extract_title_from_content(html_content)
+                if not title and truncated:
+                    # Header was not enough; fall back to the full document. HTML
+                    # parsing only looks at the first 5000 cleaned characters, so
+                    # it is repeated only if the header did not already settle them.
+                    snippet_complete = html_snippet_is_final(html_content)
+                    html_content = head + f.read()
+                    title = extract_title_from_content(html_content, use_html_parsing=not snippet_complete)
+                # Each HTML file is read once per run; don't let it crowd the page cache
+                fadvise(f, FADV_DONTNEED)
+            if title:
                 return title
         except Exception as e:
             print(f"Error reading HTML file {html_path}: {e}")
@@ -231,44 +266,39 @@ def extract_case_title(html_path: str, json_filename: str) -> Optional[str]:
     
     return None
 
-def update_json_file(json_path: str, law_finder_path: str) -> bool:
-    """Update a single JSON file with extracted case title."""
+def update_json_file(json_path: str, law_finder_path: str) -> Tuple[bool, Optional[list]]:
+    """Update a single JSON file with extracted case title.
+    
+    Returns whether the file was updated, and its manifest entry (None on error).
+    """
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            raw = f.read()
+        data = load_json(raw)
         
         # Skip if already has a valid title
-        if data.get('caseTitle') and data['caseTitle'] != 'pages.gif':
-            return False
+        if has_case_title(data):
+            return False, manifest_entry(json_path, data)
         
         # Get source path from metadata
         source_path = data.get('metadata', {}).get('sourcePath', '')
         if not source_path:
             # Try filename as fallback
             title = extract_title_from_filename(json_path)
-            if title:
-                data['caseTitle'] = title
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                return True
-            return False
-        
-        # Construct full HTML path
-        html_path = os.path.join(law_finder_path, source_path)
-        
-        # Extract title
-        title = extract_case_title(html_path, json_path)
+        else:
+            # Construct full HTML path
+            html_path = os.path.join(law_finder_path, source_path)
+            
+            # Extract title
+            title = extract_case_title(html_path, json_path)
         
         if title:
-            data['caseTitle'] = title
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            return True
+            write_json_fields(json_path, raw, data, {'caseTitle': title})
         
-        return False
+        return bool(title), manifest_entry(json_path, data)
     except Exception as e:
         print(f"Error processing {json_path}: {e}")
-        return False
+        return False, None
 
 def main():
     """Main function to process all JSON files."""
@@ -285,22 +315,44 @@ def main():
         print(f"Error: {law_finder_dir} does not exist")
         return
     
-    # Get all JSON files
-    json_files = list(json_dir.glob('*.json'))
-    total = len(json_files)
+    total = 0
+    skipped = 0
     updated = 0
     failed = 0
     
-    print(f"Processing {total} JSON files...")
+    # Stream JSON files from the directory, skipping files the manifest marks
+    # as complete and unchanged without opening them
+    manifest = load_manifest(json_dir)
+    pending_names = []
     
-    for i, json_file in enumerate(json_files, 1):
-        if i % 100 == 0:
-            print(f"Processed {i}/{total} files...")
+    def pending_paths():
+        nonlocal total, skipped
+        for entry in iter_json_files(json_dir):
+            total += 1
+            if is_complete(manifest, entry, MANIFEST_HAS_TITLE):
+                skipped += 1
+                continue
+            pending_names.append(entry.name)
+            yield entry.path
+    
+    # Files are independent, so fan out across processes (regex work is CPU-bound)
+    worker = partial(update_json_file, law_finder_path=str(law_finder_dir))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Executor.map collects its input up front, so the counts are final here
+        results = executor.map(worker, pending_paths(), chunksize=64)
+        print(f"Processing {len(pending_names)} of {total} JSON files...")
         
-        if update_json_file(str(json_file), str(law_finder_dir)):
-            updated += 1
-        else:
-            failed += 1
+        progress = track_progress(results, len(pending_names))
+        for (result, entry), name in zip(progress, pending_names):
+            if entry:
+                manifest[name] = entry
+            if result:
+                updated += 1
+            else:
+                failed += 1
+    
+    failed += skipped
+    save_manifest(json_dir, manifest)
     
     print(f"\nCompleted!")
     print(f"Updated: {updated}")
@@ -4,138 +4,182 @@ Script to extract trial/judgment dates from HTML files and update JSON files.
 Only extracts dates that are actually present in the HTML - no hallucinations.
 """
 
-import json
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from html.parser import HTMLParser
-from html import unescape
-from typing import Optional, List
+from typing import List, Optional, Tuple
 from datetime import datetime
 
-class DateExtractor(HTMLParser):
-    """HTML parser to extract text from first 150 lines for date extraction."""
-    def __init__(self):
-        super().__init__()
-        self.text_lines = []
-        self.in_body = False
-        self.line_count = 0
-        self.max_lines = 150
-        
-    def handle_starttag(self, tag, attrs):
-        if tag.lower() == 'body':
-            self.in_body = True
-            
-    def handle_endtag(self, tag):
-        if tag.lower() == 'body':
-            self.in_body = False
-            
-    def handle_data(self, data):
-        if self.in_body and self.line_count < self.max_lines:
-            lines = data.split('\n')
-            for line in lines:
-                if self.line_count >= self.max_lines:
-                    break
-                stripped = line.strip()
-                if stripped:
-                    self.text_lines.append(stripped)
-                    self.line_count += 1
+from extraction_common import (
+    FADV_DONTNEED, FADV_WILLNEED, HTML_HEAD_CHARS, MANIFEST_HAS_DATE, body_text_lines,
+    complete_html_head, fadvise, is_complete, iter_json_files, load_json, load_manifest,
+    manifest_entry, save_manifest, track_progress, write_json_fields,
+)
+
+# Date patterns, compiled once at import
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+
+_MONTH_LENGTHS = sorted({len(name) for name in _MONTHS}, reverse=True)
+
+# Single date tokenizer; month words are checked against _MONTHS after matching
+_DATE_TOKEN_RE = re.compile(
+    r'(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]+),?\s+(\d{4})'    # "26th March, 2004" or "15TH NOVEMBER 2006"
+    r'|([A-Za-z]+)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})'   # "March 26, 2004"
+    r'|(\d{1,2})/(\d{1,2})/(\d{4})'                           # DD/MM/YYYY or MM/DD/YYYY
+    r'|(\d{4})-(\d{1,2})-(\d{1,2})',                          # YYYY-MM-DD
+    re.IGNORECASE,
+)
+
+_HTML_DATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    # Pattern for dates with superscript: <u>15<sup>TH</sup> NOVEMBER, 2006</u>
+    r'<[^>]*>(\d{1,2})<[^>]*>(?:ST|ND|RD|TH)<[^>]*>\s*(JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s*(\d{4})',
+    # Pattern for dates in underlined sections
+    r'<u[^>]*>(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
+)]
+
+_BRACKET_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'\[(\d{1,2}/\d{1,2}/\d{4})\]',  # [26/03/2004]
+    r'\[(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})\]',  # [26th March, 2004]
+)]
+
+_WRITTEN_DATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'(?:H\d+/\d+/\d+|NO\.?\s*[A-Z]?\.?\d+/\d+|J\.\d+/\d+)[^.]*?(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
+    r'(?:Coram|CORAM)[^.]*?(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
+    r'(?:JUDGMENT|Judgment)[^.]*?(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
+    # Pattern for uppercase dates: "15TH NOVEMBER, 2006"
+    r'(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
+)]
+
+_STANDALONE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'^(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
+    r'^(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
+    # Also match dates that might be in underlined/bold sections
+    r'<u>(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
+)]
+
+# Words (substring match) marking a standalone date as part of a sentence
+_SENTENCE_WORDS_RE = re.compile(r'FROM|TO|ON|AT|BEFORE|AFTER|DURING')
+# Words (substring match) marking a DD/MM/YYYY date as near a case title or number
+_CASE_CONTEXT_RE = re.compile(r'V\.|VRS|VERSUS|H1/|NO\.|CASE')
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
 
 def extract_text_first_150_lines(html_content: str) -> List[str]:
     """Extract plain text from first 150 lines of HTML body."""
-    parser = DateExtractor()
     try:
-        parser.feed(html_content)
-        return parser.text_lines[:150]
+        return body_text_lines(html_content, 150)
     except Exception as e:
         print(f"Error extracting text: {e}")
         return []
 
+def _iso_date(year: int, month: int, day: int) -> Optional[str]:
+    """Format a date as YYYY-MM-DD, or None if it is not a valid date."""
+    try:
+        return datetime(year, month, day).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+def _month_suffix(word: str) -> Optional[int]:
+    """Month number for a word ending in a month name (e.g. 'March' or 'onMarch')."""
+    word = word.lower()
+    for length in _MONTH_LENGTHS:
+        month = _MONTHS.get(word[-length:])
+        if month:
+            return month
+    return None
+
+def _find_dmy(line: str) -> Optional[Tuple[int, int, int]]:
+    """Find the first D/M/YYYY date (one- or two-digit day and month) without a regex.
+    
+    Returns (day, month, year) in the order written; day and month may need swapping.
+    """
+    slash = line.find('/')
+    while slash != -1:
+        # One or two digits before the first slash, then one or two before the second
+        day_start = slash - 2 if slash >= 2 and line[slash - 2:slash].isdecimal() else slash - 1
+        if day_start >= 0 and line[day_start:slash].isdecimal():
+            month_end = line.find('/', slash + 1)
+            if slash + 1 < month_end <= slash + 3 and line[slash + 1:month_end].isdecimal():
+                year = line[month_end + 1:month_end + 5]
+                if len(year) == 4 and year.isdecimal():
+                    return int(line[day_start:slash]), int(line[slash + 1:month_end]), int(year)
+        slash = line.find('/', slash + 1)
+    return None
+
 def parse_date_from_text(date_str: str) -> Optional[str]:
     """Parse a date string and return in ISO format (YYYY-MM-DD) or original format if parsing fails."""
     date_str = date_str.strip()
     
-    # Try to parse various date formats
-    date_formats = [
-        # Written formats: "26th March, 2004" or "26 March 2004" or "March 26, 2004"
-        (r'(\d{1,2})(?:st|nd|rd|th)?\s+(January|February|March|April|May|June|July|August|September|October|November|December),?\s+(\d{4})', '%d %B %Y'),
-        (r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})', '%B %d %Y'),
-        # Uppercase formats: "15TH NOVEMBER, 2006" or "15TH NOVEMBER 2006"
-        (r'(\d{1,2})(?:ST|ND|RD|TH)?\s+(JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+(\d{4})', '%d %B %Y'),
-        # DD/MM/YYYY or MM/DD/YYYY
-        (r'(\d{1,2})/(\d{1,2})/(\d{4})', None),  # Special handling
-        # YYYY-MM-DD
-        (r'(\d{4})-(\d{1,2})-(\d{1,2})', '%Y-%m-%d'),
-    ]
+    # Keep the first match of each format; formats are tried in order below
+    first = {}
+    for match in _DATE_TOKEN_RE.finditer(date_str):
+        groups = match.groups()
+        if groups[0] is not None:
+            if groups[1].lower() in _MONTHS:
+                first.setdefault('dmy', groups[0:3])
+        elif groups[3] is not None:
+            # The month may follow other letters here, as nothing delimits it on the left
+            if _month_suffix(groups[3]):
+                first.setdefault('mdy', groups[3:6])
+        elif groups[6] is not None:
+            first.setdefault('numeric', groups[6:9])
+        else:
+            first.setdefault('iso', groups[9:12])
     
-    for pattern, fmt in date_formats:
-        match = re.search(pattern, date_str, re.IGNORECASE)
-        if match:
-            if fmt is None:  # DD/MM/YYYY format
-                day, month, year = match.groups()
-                try:
-                    # Try DD/MM/YYYY first (common in Ghana)
-                    dt = datetime(int(year), int(month), int(day))
-                    return dt.strftime('%Y-%m-%d')
-                except ValueError:
-                    # Try MM/DD/YYYY
-                    try:
-                        dt = datetime(int(year), int(day), int(month))
-                        return dt.strftime('%Y-%m-%d')
-                    except ValueError:
-                        continue
-            else:
-                try:
-                    # Clean up the date string
-                    clean_date = match.group(0)
-                    # Remove ordinal suffixes (case insensitive)
-                    clean_date = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', clean_date, flags=re.IGNORECASE)
-                    # Remove commas
-                    clean_date = clean_date.replace(',', '')
-                    # Convert to title case for month names if needed
-                    clean_date = clean_date.title()
-                    dt = datetime.strptime(clean_date.strip(), fmt)
-                    return dt.strftime('%Y-%m-%d')
-                except (ValueError, AttributeError):
-                    continue
+    # Written formats: "26th March, 2004" or "15TH NOVEMBER, 2006", then "March 26, 2004"
+    if 'dmy' in first:
+        day, month, year = first['dmy']
+        parsed = _iso_date(int(year), _MONTHS[month.lower()], int(day))
+        if parsed:
+            return parsed
+    if 'mdy' in first:
+        month, day, year = first['mdy']
+        parsed = _iso_date(int(year), _month_suffix(month), int(day))
+        if parsed:
+            return parsed
+    
+    # DD/MM/YYYY first (common in Ghana), then MM/DD/YYYY
+    if 'numeric' in first:
+        day, month, year = first['numeric']
+        parsed = _iso_date(int(year), int(month), int(day)) or _iso_date(int(year), int(day), int(month))
+        if parsed:
+            return parsed
+    
+    # YYYY-MM-DD
+    if 'iso' in first:
+        year, month, day = first['iso']
+        parsed = _iso_date(int(year), int(month), int(day))
+        if parsed:
+            return parsed
     
     # If we can't parse it, return the original (cleaned up)
-    return date_str.strip()
+    return date_str
 
-def find_judgment_date_in_html(html_content: str) -> Optional[str]:
-    """Find judgment date in HTML content."""
+def find_judgment_date_in_html(html_content: str, lines: Optional[List[str]] = None) -> Optional[str]:
+    """Find judgment date in HTML content.
+    
+    lines may carry the first 150 body text lines if the caller already has them.
+    """
     # First, try to extract dates directly from HTML (before removing tags)
     # This helps catch dates split across HTML tags like <u>15<sup>TH</sup> NOVEMBER, 2006</u>
     
-    # Remove script and style tags first
-    html_clean = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-    html_clean = re.sub(r'<style[^>]*>.*?</style>', '', html_clean, flags=re.DOTALL | re.IGNORECASE)
+    # Remove script and style tags first (single pass over the document)
+    html_clean = _SCRIPT_STYLE_RE.sub('', html_content)
     
     # Look for dates in HTML (handles split tags)
-    html_date_patterns = [
-        # Pattern for dates with superscript: <u>15<sup>TH</sup> NOVEMBER, 2006</u>
-        r'<[^>]*>(\d{1,2})<[^>]*>(?:ST|ND|RD|TH)<[^>]*>\s*(JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s*(\d{4})',
-        # Pattern for dates in underlined sections
-        r'<u[^>]*>(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
-    ]
-    
-    for pattern in html_date_patterns:
-        match = re.search(pattern, html_clean, re.IGNORECASE)
+    for pattern in _HTML_DATE_PATTERNS:
+        match = pattern.search(html_clean)
         if match:
             if len(match.groups()) == 3:  # Date with superscript
                 day, month, year = match.groups()
-                try:
-                    month_map = {
-                        'JANUARY': 'January', 'FEBRUARY': 'February', 'MARCH': 'March',
-                        'APRIL': 'April', 'MAY': 'May', 'JUNE': 'June',
-                        'JULY': 'July', 'AUGUST': 'August', 'SEPTEMBER': 'September',
-                        'OCTOBER': 'October', 'NOVEMBER': 'November', 'DECEMBER': 'December'
-                    }
-                    month_name = month_map.get(month.upper(), month.title())
-                    dt = datetime(int(year), datetime.strptime(month_name, '%B').month, int(day))
-                    return dt.strftime('%Y-%m-%d')
-                except (ValueError, KeyError):
-                    continue
+                month_number = _MONTHS.get(month.lower())
+                parsed = _iso_date(int(year), month_number, int(day)) if month_number else None
+                if parsed:
+                    return parsed
             else:  # Full date match
                 date_str = match.group(1)
                 parsed = parse_date_from_text(date_str)
@@ -143,7 +187,8 @@ def find_judgment_date_in_html(html_content: str) -> Optional[str]:
                     return parsed
     
     # Extract text from first 150 lines (header area)
-    lines = extract_text_first_150_lines(html_content)
+    if lines is None:
+        lines = extract_text_first_150_lines(html_content)
     if not lines:
         return None
     
@@ -151,13 +196,8 @@ def find_judgment_date_in_html(html_content: str) -> Optional[str]:
     header_text = ' '.join(lines[:50])  # First 50 lines should contain the date
     
     # Pattern 1: Date in brackets with case title: [26/03/2004] or [26 March 2004]
-    bracket_patterns = [
-        r'\[(\d{1,2}/\d{1,2}/\d{4})\]',  # [26/03/2004]
-        r'\[(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})\]',  # [26th March, 2004]
-    ]
-    
-    for pattern in bracket_patterns:
-        match = re.search(pattern, header_text, re.IGNORECASE)
+    for pattern in _BRACKET_PATTERNS:
+        match = pattern.search(header_text)
         if match:
             date_str = match.group(1)
             parsed = parse_date_from_text(date_str)
@@ -166,16 +206,8 @@ def find_judgment_date_in_html(html_content: str) -> Optional[str]:
     
     # Pattern 2: Written date format near case number or after "Coram"
     # Look for dates that appear after case numbers or near "Coram" or "JUDGMENT"
-    written_date_patterns = [
-        r'(?:H\d+/\d+/\d+|NO\.?\s*[A-Z]?\.?\d+/\d+|J\.\d+/\d+)[^.]*?(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
-        r'(?:Coram|CORAM)[^.]*?(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
-        r'(?:JUDGMENT|Judgment)[^.]*?(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
-        # Pattern for uppercase dates: "15TH NOVEMBER, 2006"
-        r'(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
-    ]
-    
-    for pattern in written_date_patterns:
-        match = re.search(pattern, header_text, re.IGNORECASE)
+    for pattern in _WRITTEN_DATE_PATTERNS:
+        match = pattern.search(header_text)
         if match:
             date_str = match.group(1)
             parsed = parse_date_from_text(date_str)
@@ -184,20 +216,13 @@ def find_judgment_date_in_html(html_content: str) -> Optional[str]:
     
     # Pattern 3: Standalone written date in header (uppercase or title case)
     # Look for dates that are on their own line or clearly separated
-    standalone_patterns = [
-        r'^(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
-        r'^(\d{1,2}(?:st|nd|rd|th)?\s+(?:January|February|March|April|May|June|July|August|September|October|November|December),?\s+\d{4})',
-        # Also match dates that might be in underlined/bold sections
-        r'<u>(\d{1,2}(?:ST|ND|RD|TH)?\s+(?:JANUARY|FEBRUARY|MARCH|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER),?\s+\d{4})',
-    ]
-    
     for line in lines[:30]:  # Check first 30 lines
-        for pattern in standalone_patterns:
-            match = re.match(pattern, line, re.IGNORECASE)
+        for pattern in _STANDALONE_PATTERNS:
+            match = pattern.match(line)
             if match:
                 date_str = match.group(1)
                 # Skip if it's clearly part of a sentence or contains other words
-                if any(word in line.upper() for word in ['FROM', 'TO', 'ON', 'AT', 'BEFORE', 'AFTER', 'DURING']):
+                if _SENTENCE_WORDS_RE.search(line.upper()):
                     continue
                 parsed = parse_date_from_text(date_str)
                 if parsed and len(parsed) >= 10:
@@ -205,16 +230,16 @@ def find_judgment_date_in_html(html_content: str) -> Optional[str]:
     
     # Pattern 4: Date in DD/MM/YYYY format near case title (not in brackets)
     # Only if it appears very early in the document
-    early_date_pattern = r'(\d{1,2}/\d{1,2}/\d{4})'
     for i, line in enumerate(lines[:20]):  # First 20 lines only
-        match = re.search(early_date_pattern, line)
-        if match:
-            date_str = match.group(1)
+        found = _find_dmy(line)
+        if found:
+            day, month, year = found
             # Check if it's near case title or case number
             context = ' '.join(lines[max(0, i-2):i+3])
-            if any(word in context.upper() for word in ['V.', 'VRS', 'VERSUS', 'H1/', 'NO.', 'CASE']):
-                parsed = parse_date_from_text(date_str)
-                if parsed and len(parsed) >= 10:
+            if _CASE_CONTEXT_RE.search(context.upper()):
+                # DD/MM/YYYY first (common in Ghana), then MM/DD/YYYY
+                parsed = _iso_date(year, month, day) or _iso_date(year, day, month)
+                if parsed:
                     return parsed
     
     return None
@@ -226,28 +251,42 @@ def extract_trial_date(html_path: str) -> Optional[str]:
     
     try:
         with open(html_path, 'r', encoding='utf-8', errors='ignore') as f:
-            html_content = f.read()
-        
-        date = find_judgment_date_in_html(html_content)
+            # The judgment date sits in the document header, so avoid reading whole files
+            fadvise(f, FADV_WILLNEED, HTML_HEAD_CHARS)
+            head = f.read(HTML_HEAD_CHARS)
+            truncated = len(head) == HTML_HEAD_CHARS
+            # A date line straddling the cut must not be matched half-read
+            html_content = complete_html_head(head) if truncated else head
+            date = find_judgment_date_in_html(html_content)
+            if not date and truncated:
+                # Nothing in the header; fall back to the full document
+                html_content = head + f.read()
+                date = find_judgment_date_in_html(html_content)
+            # Each HTML file is read once per run; don't let it crowd the page cache
+            fadvise(f, FADV_DONTNEED)
         return date
     except Exception as e:
         print(f"Error reading HTML file {html_path}: {e}")
         return None
 
-def update_json_file(json_path: str, law_finder_path: str) -> bool:
-    """Update a single JSON file with extracted trial date."""
+def update_json_file(json_path: str, law_finder_path: str) -> Tuple[bool, Optional[list]]:
+    """Update a single JSON file with extracted trial date.
+    
+    Returns whether the file was updated, and its manifest entry (None on error).
+    """
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            raw = f.read()
+        data = load_json(raw)
         
         # Skip if already has a date
         if 'trialDate' in data and data['trialDate']:
-            return False
+            return False, manifest_entry(json_path, data)
         
         # Get source path from metadata
         source_path = data.get('metadata', {}).get('sourcePath', '')
         if not source_path:
-            return False
+            return False, manifest_entry(json_path, data)
         
         # Construct full HTML path
         html_path = os.path.join(law_finder_path, source_path)
@@ -256,15 +295,12 @@ def update_json_file(json_path: str, law_finder_path: str) -> bool:
         date = extract_trial_date(html_path)
         
         if date:
-            data['trialDate'] = date
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            return True
+            write_json_fields(json_path, raw, data, {'trialDate': date})
         
-        return False
+        return bool(date), manifest_entry(json_path, data)
     except Exception as e:
         print(f"Error processing {json_path}: {e}")
-        return False
+        return False, None
 
 def main():
     """Main function to process all JSON files."""
@@ -281,22 +317,44 @@ def main():
         print(f"Error: {law_finder_dir} does not exist")
         return
     
-    # Get all JSON files
-    json_files = list(json_dir.glob('*.json'))
-    total = len(json_files)
+    total = 0
+    skipped = 0
     updated = 0
     failed = 0
     
-    print(f"Processing {total} JSON files to extract trial dates...")
+    # Stream JSON files from the directory, skipping files the manifest marks
+    # as complete and unchanged without opening them
+    manifest = load_manifest(json_dir)
+    pending_names = []
+    
+    def pending_paths():
+        nonlocal total, skipped
+        for entry in iter_json_files(json_dir):
+            total += 1
+            if is_complete(manifest, entry, MANIFEST_HAS_DATE):
+                skipped += 1
+                continue
+            pending_names.append(entry.name)
+            yield entry.path
     
-    for i, json_file in enumerate(json_files, 1):
-        if i % 100 == 0:
-            print(f"Processed {i}/{total} files... (Updated: {updated}, Failed: {failed})")
+    # Files are independent, so fan out across processes (regex work is CPU-bound)
+    worker = partial(update_json_file, law_finder_path=str(law_finder_dir))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Executor.map collects its input up front, so the counts are final here
+        results = executor.map(worker, pending_paths(), chunksize=64)
+        print(f"Processing {len(pending_names)} of {total} JSON files to extract trial dates...")
         
-        if update_json_file(str(json_file), str(law_finder_dir)):
-            updated += 1
-        else:
-            failed += 1
+        progress = track_progress(results, len(pending_names))
+        for (result, entry), name in zip(progress, pending_names):
+            if entry:
+                manifest[name] = entry
+            if result:
+                updated += 1
+            else:
+                failed += 1
+    
+    failed += skipped
+    save_manifest(json_dir, manifest)
     
     print(f"\nCompleted!")
     print(f"Updated: {updated}")
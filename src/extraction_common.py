@@ -0,0 +1,225 @@
+"""
+Helpers shared by the case title and trial date extraction scripts: HTML body
+text, page-cache hints, JSON reading/writing, the sidecar manifest, and progress.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from html import unescape
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: fall back to regex-based text extraction
+    LexborHTMLParser = None
+
+try:
+    from tqdm import tqdm
+except ImportError:  # optional: fall back to throttled progress lines on stderr
+    tqdm = None
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the standard json module
+    orjson = None
+
+# Sidecar file (inside the JSON directory) recording already-complete files.
+# Entries are [mtime_ns, has_title, has_date]; the indices below name the flags.
+MANIFEST_NAME = '.processed_manifest.json'
+MANIFEST_HAS_TITLE = 1
+MANIFEST_HAS_DATE = 2
+
+# Page-cache hints for the one-pass HTML reads (posix_fadvise is not available everywhere)
+FADV_WILLNEED = getattr(os, 'POSIX_FADV_WILLNEED', None)
+FADV_DONTNEED = getattr(os, 'POSIX_FADV_DONTNEED', None)
+
+# Seconds between progress lines when tqdm is not installed
+PROGRESS_INTERVAL = 5.0
+
+# Number of characters read from the start of each HTML file
+HTML_HEAD_CHARS = 65536
+
+_BODY_TAG_RE = re.compile(r'<body\b[^>]*>', re.IGNORECASE)
+_BODY_END_RE = re.compile(r'</body\s*>', re.IGNORECASE)
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_ANY_TAG_RE = re.compile(r'<[!/?A-Za-z][^>]*>')
+# Script/style contents are raw text: no tags, comments or entities inside
+_RAW_TEXT_RE = re.compile(r'<(script|style)\b[^>]*>(.*?)</\1\s*>', re.DOTALL | re.IGNORECASE)
+
+def _markup_text_runs(markup: str) -> Iterator[str]:
+    """Yield the non-blank text runs of markup, with entities decoded."""
+    # Every tag or comment ends a text run, as with HTMLParser.handle_data
+    for chunk in _ANY_TAG_RE.sub('\n', _COMMENT_RE.sub('\n', markup)).split('\n'):
+        if chunk.strip():
+            yield unescape(chunk)
+
+def _text_runs(body: str) -> Iterator[str]:
+    """Yield the text runs of an HTML fragment as HTMLParser.handle_data sees them."""
+    pos = 0
+    for match in _RAW_TEXT_RE.finditer(body):
+        yield from _markup_text_runs(body[pos:match.start()])
+        # Script/style text is one raw run, left undecoded like HTMLParser does
+        yield match.group(2)
+        pos = match.end()
+    yield from _markup_text_runs(body[pos:])
+
+def _regex_body_lines(html_content: str, max_lines: int) -> List[str]:
+    """Return the first non-empty text lines of the HTML body without an HTML parser."""
+    body_start = _BODY_TAG_RE.search(html_content)
+    if not body_start:
+        return []
+    body_end = _BODY_END_RE.search(html_content, body_start.end())
+    body = html_content[body_start.end():body_end.start() if body_end else len(html_content)]
+    lines = []
+    for run in _text_runs(body):
+        for line in run.split('\n'):
+            stripped = line.strip()
+            if stripped:
+                lines.append(stripped)
+                if len(lines) >= max_lines:
+                    return lines
+    return lines
+
+def _lexbor_body_lines(html_content: str, max_lines: int) -> List[str]:
+    """Return the first non-empty text lines of the HTML body using lexbor."""
+    # Files without a real <body> tag yield no text, matching the stdlib parser
+    if not _BODY_TAG_RE.search(html_content):
+        return []
+    body = LexborHTMLParser(html_content).body
+    text = body.text(separator='\n') if body else ''
+    lines = []
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped:
+            lines.append(stripped)
+            if len(lines) >= max_lines:
+                break
+    return lines
+
+def body_text_lines(html_content: str, max_lines: int) -> List[str]:
+    """Return the first non-empty text lines of the HTML body (lexbor if installed)."""
+    if LexborHTMLParser is not None:
+        return _lexbor_body_lines(html_content, max_lines)
+    return _regex_body_lines(html_content, max_lines)
+
+def fadvise(f, advice: Optional[int], length: int = 0) -> None:
+    """Pass a page-cache hint for an open file; a no-op where unsupported."""
+    if advice is None:
+        return
+    try:
+        os.posix_fadvise(f.fileno(), 0, length, advice)
+    except OSError:
+        pass
+
+def complete_html_head(html_head: str) -> str:
+    """Cut a truncated HTML head back to its last tag end, so no text run is cut short.
+
+    Falls back to the last newline when the head holds no '>' at all.
+    """
+    cut = html_head.rfind('>')
+    if cut == -1:
+        cut = html_head.rfind('\n')
+    return html_head[:cut + 1] if cut != -1 else html_head
+
+def append_json_key(raw: str, key: str, value: str) -> Optional[str]:
+    """Append a new top-level key to indent=2 JSON text without re-serializing it.
+
+    Produces the same text json.dump(indent=2, ensure_ascii=False) would for the
+    updated dict. Returns None if the text is not in that layout.
+    """
+    body = raw.rstrip()
+    if not raw.startswith('{\n  "') or not body.endswith('}'):
+        return None
+    head = body[:-1].rstrip()
+    entry = f'{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}'
+    return f'{head},\n  {entry}\n}}{raw[len(body):]}'
+
+def load_json(raw: str):
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN or out-of-range integers, which only json accepts
+    return json.loads(raw)
+
+def dump_json(data) -> bytes:
+    """Serialize data as indent=2 UTF-8 JSON, as json.dump(indent=2, ensure_ascii=False) does.
+
+    Only full rewrites get here (new keys are spliced in), so this stays on the json
+    module: orjson would write NaN/Infinity as null and format floats differently.
+    Lone surrogates are written as \\u escapes rather than invalid UTF-8.
+    """
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8', 'backslashreplace')
+
+def write_json_fields(json_path: str, raw: str, data: dict, fields: Dict[str, str]) -> None:
+    """Set fields and write the JSON file once, splicing the text when all keys are new."""
+    new_raw: Optional[str] = raw
+    for key, value in fields.items():
+        if new_raw is not None:
+            new_raw = append_json_key(new_raw, key, value) if key not in data else None
+        data[key] = value
+    if new_raw is not None:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            f.write(new_raw)
+    else:
+        with open(json_path, 'wb') as f:
+            f.write(dump_json(data))
+
+def has_case_title(data: dict) -> bool:
+    """Whether the JSON data already holds a real case title (not the 'pages.gif' placeholder)."""
+    return bool(data.get('caseTitle')) and data['caseTitle'] != 'pages.gif'
+
+def load_manifest(json_dir: Path) -> Dict[str, list]:
+    """Load the sidecar manifest: JSON filename -> [mtime_ns, has_title, has_date]."""
+    try:
+        with open(json_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return load_json(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(json_dir: Path, manifest: Dict[str, list]) -> None:
+    """Write the sidecar manifest atomically."""
+    manifest_path = json_dir / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+def manifest_entry(json_path: str, data: dict) -> list:
+    """Build a manifest entry from the file's mtime and which fields are filled."""
+    return [os.stat(json_path).st_mtime_ns, has_case_title(data), bool(data.get('trialDate'))]
+
+def iter_json_files(json_dir: Path) -> Iterator[os.DirEntry]:
+    """Yield the JSON files in json_dir (excluding the manifest) as they are listed."""
+    with os.scandir(json_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json') and entry.name != MANIFEST_NAME and entry.is_file():
+                yield entry
+
+def is_complete(manifest: Dict[str, list], json_file: os.DirEntry, *flags: int) -> bool:
+    """Check the manifest for an unchanged file whose flagged fields are all filled.
+
+    flags are MANIFEST_HAS_TITLE and/or MANIFEST_HAS_DATE.
+    """
+    entry = manifest.get(json_file.name)
+    return bool(entry and all(entry[flag] for flag in flags)
+                and entry[0] == json_file.stat().st_mtime_ns)
+
+def track_progress(results: Iterable, total: int) -> Iterator:
+    """Yield results while reporting progress (tqdm if installed, else throttled stderr)."""
+    if tqdm is not None:
+        yield from tqdm(results, total=total, unit='file')
+        return
+    last_report = time.monotonic()
+    for i, result in enumerate(results, 1):
+        now = time.monotonic()
+        if now - last_report >= PROGRESS_INTERVAL:
+            sys.stderr.write(f"Processed {i}/{total} files...\n")
+            sys.stderr.flush()
+            last_report = now
+        yield result